@@ -1,19 +1,41 @@
-from fastapi import FastAPI
+import orjson
+from fastapi import FastAPI, Response
+from fastapi.responses import ORJSONResponse
 
-app = FastAPI(title="Example 1: Hello World")
+# ORJSONResponse encodes JSON with orjson (written in Rust), which is much
+# faster than the standard library json module
+app = FastAPI(title="Example 1: Hello World", default_response_class=ORJSONResponse)
+
+# These responses never change, so we turn them into JSON bytes once,
+# at startup, instead of encoding the same dict on every request
+ROOT_BODY = orjson.dumps({"message": "Hello, World!"})
 
 @app.get("/")
-def read_root():
+async def read_root():
     """
     The simplest possible endpoint.
     Visit: http://localhost:8000
     """
-    return {"message": "Hello, World!"}
+    return Response(content=ROOT_BODY, media_type="application/json")
+
+GREET_BODY = orjson.dumps({"message": "Welcome to FastAPI!"})
 
 @app.get("/greet")
-def greet():
+async def greet():
     """
     Another simple endpoint.
     Visit: http://localhost:8000/greet
     """
-    return {"message": "Welcome to FastAPI!"}
\ No newline at end of file
+    return Response(content=GREET_BODY, media_type="application/json")
+
+# Run with: python main1.py
+# "auto" uses uvloop and httptools, the fast event loop and HTTP parser
+# (written in C), when they are installed - and the plain ones otherwise
+# (e.g. on Windows). access_log=False skips a log line for every request
+if __name__ == "__main__":
+    import uvicorn
+    uvicorn.run(
+        app, host="127.0.0.1", port=8000,
+        loop="auto", http="auto",
+        log_level="warning", access_log=False
+    )
@@ -1,20 +1,24 @@
-from fastapi import FastAPI
+import orjson
+from fastapi import FastAPI, Response
+from fastapi.responses import ORJSONResponse
 
-app = FastAPI(title="Example 2: Path Parameters")
+app = FastAPI(title="Example 2: Path Parameters", default_response_class=ORJSONResponse)
+
+ROOT_BODY = orjson.dumps({
+    "message": "Try these URLs:",
+    "examples": [
+        "/users/123",
+        "/users/alice",
+        "/items/5/details"
+    ]
+})
 
 @app.get("/")
-def read_root():
-    return {
-        "message": "Try these URLs:",
-        "examples": [
-            "/users/123",
-            "/users/alice",
-            "/items/5/details"
-        ]
-    }
+async def read_root():
+    return Response(content=ROOT_BODY, media_type="application/json")
 
 @app.get("/users/{user_id}")
-def get_user(user_id: int):
+async def get_user(user_id: int):
     """
     Path parameter with TYPE.
     Try: /users/123 ✅
@@ -27,7 +31,7 @@ def get_user(user_id: int):
     }
 
 @app.get("/users/{username}/profile")
-def get_user_profile(username: str):
+async def get_user_profile(username: str):
     """
     Path parameter as string.
     Try: /users/alice/profile
@@ -39,7 +43,7 @@ def get_user_profile(username: str):
     }
 
 @app.get("/items/{item_id}/details")
-def get_item_details(item_id: int):
+async def get_item_details(item_id: int):
     """
     Multiple path segments.
     Try: /items/5/details
@@ -49,18 +53,28 @@ def get_item_details(item_id: int):
         "details": f"Details for item #{item_id}"
     }
 
+LATEST_PRODUCTS_BODY = orjson.dumps({"message": "Here are the latest products"})
+
 # IMPORTANT: Order matters! More specific routes FIRST
 @app.get("/products/latest")
-def get_latest_products():
+async def get_latest_products():
     """
     This MUST come BEFORE /products/{product_id}
     Otherwise "latest" would be treated as a product_id!
     """
-    return {"message": "Here are the latest products"}
+    return Response(content=LATEST_PRODUCTS_BODY, media_type="application/json")
 
 @app.get("/products/{product_id}")
-def get_product(product_id: int):
+async def get_product(product_id: int):
     """
     This comes AFTER the specific route.
     """
-    return {"product_id": product_id}
\ No newline at end of file
+    return {"product_id": product_id}
+
+if __name__ == "__main__":
+    import uvicorn
+    uvicorn.run(
+        app, host="127.0.0.1", port=8000,
+        loop="auto", http="auto",
+        log_level="warning", access_log=False
+    )
@@ -1,24 +1,28 @@
-from fastapi import FastAPI, Query
+import orjson
+from fastapi import FastAPI, Query, Response
+from fastapi.responses import ORJSONResponse
 from typing import Optional
 
-app = FastAPI(title="Example 3: Query Parameters")
+app = FastAPI(title="Example 3: Query Parameters", default_response_class=ORJSONResponse)
+
+ROOT_BODY = orjson.dumps({
+    "message": "Query parameter examples",
+    "examples": [
+        "/search?q=python",
+        "/search?q=python&limit=5",
+        "/items?skip=10&limit=20",
+        "/filter?min_price=10&max_price=100&in_stock=true",
+    ],
+})
 
 
 @app.get("/")
-def read_root():
-    return {
-        "message": "Query parameter examples",
-        "examples": [
-            "/search?q=python",
-            "/search?q=python&limit=5",
-            "/items?skip=10&limit=20",
-            "/filter?min_price=10&max_price=100&in_stock=true",
-        ],
-    }
+async def read_root():
+    return Response(content=ROOT_BODY, media_type="application/json")
 
 
 @app.get("/search")
-def search(
+async def search(
     q: str, limit: int = 10  # Required (no default value)  # Optional (has default)
 ):
     """
@@ -37,7 +41,7 @@ def search(
 
 
 @app.get("/items")
-def list_items(skip: int = 0, limit: int = 10, sort_by: Optional[str] = None):
+async def list_items(skip: int = 0, limit: int = 10, sort_by: Optional[str] = None):
     """
     All parameters are optional here.
 
@@ -55,7 +59,7 @@ def list_items(skip: int = 0, limit: int = 10, sort_by: Optional[str] = None):
 
 
 @app.get("/filter")
-def filter_items(
+async def filter_items(
     min_price: float = Query(0, ge=0, description="Minimum price"),
     max_price: float = Query(1000, le=10000, description="Maximum price"),
     in_stock: bool = Query(True, description="Only in-stock items?"),
@@ -82,7 +86,7 @@ def filter_items(
 
 
 @app.get("/compare")
-def compare_params(
+async def compare_params(
     path_id: str = "default",  # Query parameter (has =)
 ):
     """
@@ -94,9 +98,18 @@ def compare_params(
 
 
 @app.get("/compare/{path_id}")
-def compare_path(path_id: str):
+async def compare_path(path_id: str):
     """
     This is a path parameter (in the URL path).
     Try: /compare/123
     """
     return {"path_id": path_id, "type": "path parameter"}
+
+
+if __name__ == "__main__":
+    import uvicorn
+    uvicorn.run(
+        app, host="127.0.0.1", port=8000,
+        loop="auto", http="auto",
+        log_level="warning", access_log=False
+    )
@@ -1,8 +1,10 @@
-from fastapi import FastAPI
-from pydantic import BaseModel, EmailStr
+import orjson
+from fastapi import FastAPI, Response
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, EmailStr, TypeAdapter
 from typing import Optional
 
-app = FastAPI(title="Example 5: Response Models")
+app = FastAPI(title="Example 5: Response Models", default_response_class=ORJSONResponse)
 
 # Input model (what user sends)
 class UserInput(BaseModel):
@@ -27,12 +29,14 @@ class UserDetailed(BaseModel):
     created_at: str
     login_count: int
 
+ROOT_BODY = orjson.dumps({"message": "Response model examples"})
+
 @app.get("/")
-def read_root():
-    return {"message": "Response model examples"}
+async def read_root():
+    return Response(content=ROOT_BODY, media_type="application/json")
 
 @app.post("/register", response_model=UserOutput)
-def register_user(user: UserInput):
+async def register_user(user: UserInput):
     """
     User sends: username, email, password
     We return: id, username, email, is_active
@@ -48,7 +52,7 @@ def register_user(user: UserInput):
     }
 
 @app.get("/users/{user_id}", response_model=UserOutput)
-def get_user(user_id: int):
+async def get_user(user_id: int):
     """
     Returns user without sensitive data.
     """
@@ -64,7 +68,7 @@ def get_user(user_id: int):
     return fake_user
 
 @app.get("/users/{user_id}/details", response_model=UserDetailed)
-def get_user_details(user_id: int):
+async def get_user_details(user_id: int):
     """
     Returns more detailed user information.
     """
@@ -77,13 +81,34 @@ def get_user_details(user_id: int):
         "login_count": 42
     }
 
-@app.get("/users-list", response_model=list[UserOutput])
-def get_users():
+# Built once: validates/serializes a whole list of users in one call
+users_adapter = TypeAdapter(list[UserOutput])
+
+# Fake database, validated and encoded once at startup instead of on
+# every request
+fake_users = users_adapter.validate_python([
+    {"id": 1, "username": "alice", "email": "alice@example.com", "is_active": True},
+    {"id": 2, "username": "bob", "email": "bob@example.com", "is_active": False},
+])
+USERS_LIST_BODY = users_adapter.dump_json(fake_users)
+
+@app.get(
+    "/users-list",
+    response_model=None,
+    responses={200: {"model": list[UserOutput]}}  # Still documented in /docs
+)
+async def get_users() -> Response:
     """
     Returns a LIST of users.
+    The list was turned into JSON bytes at startup, so there is
+    nothing left to validate or encode here.
     """
-    fake_users = [
-        {"id": 1, "username": "alice", "email": "alice@example.com", "is_active": True},
-        {"id": 2, "username": "bob", "email": "bob@example.com", "is_active": False},
-    ]
-    return fake_users
\ No newline at end of file
+    return Response(content=USERS_LIST_BODY, media_type="application/json")
+
+if __name__ == "__main__":
+    import uvicorn
+    uvicorn.run(
+        app, host="127.0.0.1", port=8000,
+        loop="auto", http="auto",
+        log_level="warning", access_log=False
+    )
@@ -1,18 +1,31 @@
-from fastapi import FastAPI, Depends, HTTPException, status
+import orjson
+from fastapi import FastAPI, Depends, HTTPException, Response, status
+from fastapi.responses import ORJSONResponse
+from dataclasses import dataclass
+import hmac
 from typing import Optional
 from datetime import datetime
+import time
 
-app = FastAPI(title="Example 7: Dependencies")
+app = FastAPI(title="Example 7: Dependencies", default_response_class=ORJSONResponse)
 
 # ===== SIMPLE DEPENDENCIES =====
 
-def get_current_time():
+# The last datetime we built, and the second it was built for
+cached_time = (0, datetime.fromtimestamp(0))
+
+async def get_current_time():
     """
     A simple dependency that provides current time.
+    Only builds a new datetime when the second changes.
     """
-    return datetime.now()
+    global cached_time
+    now = int(time.time())
+    if now != cached_time[0]:
+        cached_time = (now, datetime.fromtimestamp(now))
+    return cached_time[1]
 
-def get_user_agent(user_agent: Optional[str] = None):
+async def get_user_agent(user_agent: Optional[str] = None):
     """
     Dependency that extracts user agent from headers.
     (In real app, you'd use Header())
@@ -20,7 +33,7 @@ def get_user_agent(user_agent: Optional[str] = None):
     return user_agent or "Unknown"
 
 @app.get("/time")
-def show_time(current_time: datetime = Depends(get_current_time)):
+async def show_time(current_time: datetime = Depends(get_current_time)):
     """
     The dependency is called automatically!
     """
@@ -31,7 +44,10 @@ def show_time(current_time: datetime = Depends(get_current_time)):
 
 # ===== AUTHENTICATION DEPENDENCY =====
 
-def verify_token(token: Optional[str] = None):
+# Encoded once; compared as bytes on every request
+EXPECTED_TOKEN = b"secret-token"
+
+async def verify_token(token: Optional[str] = None):
     """
     Simulates token verification.
     In real app, you'd check against database.
@@ -41,22 +57,26 @@ def verify_token(token: Optional[str] = None):
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Token is required"
         )
-    if token != "secret-token":
+    # compare_digest takes the same time whether the first or the last
+    # character is wrong, so attackers can't guess the token bit by bit
+    if not hmac.compare_digest(token.encode(), EXPECTED_TOKEN):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid token"
         )
     return {"user_id": 123, "username": "alice"}
 
+PUBLIC_BODY = orjson.dumps({"message": "This is public"})
+
 @app.get("/public")
-def public_endpoint():
+async def public_endpoint():
     """
     No authentication required.
     """
-    return {"message": "This is public"}
+    return Response(content=PUBLIC_BODY, media_type="application/json")
 
 @app.get("/protected")
-def protected_endpoint(user: dict = Depends(verify_token)):
+async def protected_endpoint(user: dict = Depends(verify_token)):
     """
     Requires authentication.
     Try: /protected (ERROR - no token)
@@ -70,7 +90,7 @@ def protected_endpoint(user: dict = Depends(verify_token)):
 
 # ===== CHAINED DEPENDENCIES =====
 
-def get_database():
+async def get_database():
     """
     Simulates database connection.
     """
@@ -81,68 +101,95 @@ def get_database():
     finally:
         print("🔒 Closing database connection")
 
-def get_current_user(db: dict = Depends(get_database), token: Optional[str] = None):
+@dataclass
+class CurrentUser:
+    db: dict
+    user: Optional[dict]  # None if not logged in
+
+async def get_current_user(
+    db: dict = Depends(get_database), token: Optional[str] = None
+) -> CurrentUser:
     """
     This dependency DEPENDS on get_database!
     Chain: get_database → get_current_user → endpoint
+    It hands the endpoint the database AND the user, so the endpoint
+    needs just this ONE dependency.
     """
     if not token:
-        return None
+        return CurrentUser(db=db, user=None)
     # Simulate user lookup in database
-    return {"id": 1, "username": "alice", "token": token}
+    return CurrentUser(db=db, user={"id": 1, "username": "alice", "token": token})
 
 @app.get("/me")
-def get_my_profile(
-    current_user: Optional[dict] = Depends(get_current_user),
-    db: dict = Depends(get_database)
-):
+async def get_my_profile(current: CurrentUser = Depends(get_current_user)):
     """
     Uses chained dependencies.
     Try: /me
     Try: /me?token=abc123
     
-    Check your terminal - you'll see database connection messages!
+    Check your terminal - you'll see database connection messages
+    (once per request)!
     """
-    if not current_user:
-        return {"message": "Not logged in", "db_connected": db["connected"]}
+    if not current.user:
+        return {"message": "Not logged in", "db_connected": current.db["connected"]}
     return {
         "message": "Your profile",
-        "user": current_user,
-        "db_connected": db["connected"]
+        "user": current.user,
+        "db_connected": current.db["connected"]
     }
 
 # ===== REUSABLE PAGINATION =====
 
-def pagination(skip: int = 0, limit: int = 10):
+# Fake data, built once when the app starts (not on every request).
+# Slicing a tuple just copies references - no strings are re-created.
+fake_items = tuple(f"Item {i}" for i in range(100))
+fake_users = tuple(f"User {i}" for i in range(50))
+
+@dataclass(frozen=True, slots=True)
+class Page:
+    """
+    Fixed fields → attribute access (page.skip) instead of dict lookups,
+    and a smaller object than a dict.
+    """
+    skip: int
+    limit: int
+
+async def pagination(skip: int = 0, limit: int = 10) -> Page:
     """
     Reusable pagination dependency.
     """
-    return {"skip": skip, "limit": limit}
+    return Page(skip=skip, limit=limit)
 
 @app.get("/items")
-def get_items(page: dict = Depends(pagination)):
+async def get_items(page: Page = Depends(pagination)):
     """
     Uses pagination dependency.
     Try: /items
     Try: /items?skip=10&limit=5
     """
-    fake_items = [f"Item {i}" for i in range(100)]
-    start = page["skip"]
-    end = start + page["limit"]
+    start = page.skip
+    end = start + page.limit
     return {
         "items": fake_items[start:end],
         "pagination": page
     }
 
 @app.get("/users")
-def get_users(page: dict = Depends(pagination)):
+async def get_users(page: Page = Depends(pagination)):
     """
     Same pagination dependency, different endpoint!
     """
-    fake_users = [f"User {i}" for i in range(50)]
-    start = page["skip"]
-    end = start + page["limit"]
+    start = page.skip
+    end = start + page.limit
     return {
         "users": fake_users[start:end],
         "pagination": page
-    }
\ No newline at end of file
+    }
+
+if __name__ == "__main__":
+    import uvicorn
+    uvicorn.run(
+        app, host="127.0.0.1", port=8000,
+        loop="auto", http="auto",
+        log_level="warning", access_log=False
+    )
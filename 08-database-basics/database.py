@@ -3,9 +3,10 @@ This file manages the database connection.
 Think of it as the "phone line" to your database.
 """
 
-from sqlalchemy import create_engine
+import logging
+
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
 import os
 from dotenv import load_dotenv
 
@@ -19,25 +20,48 @@ DATABASE_URL = os.getenv("DATABASE_URL")
 if not DATABASE_URL:
     raise ValueError("DATABASE_URL not found in .env file!")
 
-print(f"📡 Connecting to database...")
+# We talk to PostgreSQL through the async asyncpg driver, so a plain
+# postgresql:// URL from .env is pointed at it
+if DATABASE_URL.startswith("postgresql://"):
+    DATABASE_URL = DATABASE_URL.replace("postgresql://", "postgresql+asyncpg://", 1)
+
+logger = logging.getLogger(__name__)
 
 # ===== THE ENGINE =====
 # This is like the "car" that drives data back and forth
+# It is async: while one query waits on the network, the event loop
+# keeps serving other requests instead of blocking a thread
 # echo=True means it will print SQL queries (good for learning!)
-engine = create_engine(
+# It is slow under load, so it is off unless SQL_ECHO=1 is set
+#
+# Connection pool: the defaults (5 connections + 10 overflow) make requests
+# wait once more than 15 are in flight, so we size it for FastAPI instead.
+# Instead of pinging before every checkout (an extra round-trip per request)
+# we recycle connections before the server would drop them.
+engine = create_async_engine(
     DATABASE_URL,
-    echo=True,  # Set to False in production
-    pool_pre_ping=True  # Verify connections before using them
+    echo=os.getenv("SQL_ECHO") == "1",
+    pool_size=int(os.getenv("DB_POOL_SIZE", "20")),        # Connections kept open
+    max_overflow=int(os.getenv("DB_MAX_OVERFLOW", "40")),  # Extra ones under load
+    pool_recycle=1800,  # Replace connections older than 30 minutes
+    pool_pre_ping=os.getenv("DB_POOL_PRE_PING") == "1",  # Verify before using
+    connect_args={
+        # Stop runaway queries after 5 seconds
+        "server_settings": {
+            "statement_timeout": os.getenv("DB_STATEMENT_TIMEOUT_MS", "5000")
+        }
+    }
 )
 
 # ===== THE SESSION FACTORY =====
 # This creates "conversations" with the database
-# autocommit=False: We control when to save changes
 # autoflush=False: We control when to send changes to DB
-SessionLocal = sessionmaker(
-    autocommit=False,
+# expire_on_commit=False: Objects stay readable after commit
+#   (async sessions can't lazily reload them behind our back)
+SessionLocal = async_sessionmaker(
+    engine,
     autoflush=False,
-    bind=engine
+    expire_on_commit=False
 )
 
 # ===== THE BASE CLASS =====
@@ -45,7 +69,7 @@ SessionLocal = sessionmaker(
 Base = declarative_base()
 
 # ===== DEPENDENCY FUNCTION =====
-def get_db():
+async def get_db():
     """
     This is a dependency that provides a database session.
     
@@ -59,28 +83,28 @@ def get_db():
     - Reading it (use session)
     - Returning it (close session)
     """
-    db = SessionLocal()
-    try:
+    # "async with" always closes the session, even if there's an error
+    async with SessionLocal() as db:
         yield db  # The endpoint uses the session here
-    finally:
-        db.close()  # Always close, even if there's an error
-        print("🔒 Database session closed")
 
 # ===== HELPER FUNCTIONS =====
-def create_tables():
+async def create_tables():
     """
     Create all tables in the database.
     Call this once at startup.
     """
-    print("🏗️  Creating database tables...")
-    Base.metadata.create_all(bind=engine)
-    print("✅ Tables created!")
+    logger.info("📡 Connecting to database...")
+    async with engine.begin() as conn:
+        logger.info("🏗️  Creating database tables...")
+        await conn.run_sync(Base.metadata.create_all)
+    logger.info("✅ Tables created!")
 
-def drop_tables():
+async def drop_tables():
     """
     Delete all tables (use carefully!)
     Useful for testing or resetting.
     """
-    print("💥 Dropping all tables...")
-    Base.metadata.drop_all(bind=engine)
-    print("✅ Tables dropped!")
\ No newline at end of file
+    logger.info("💥 Dropping all tables...")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+    logger.info("✅ Tables dropped!")
\ No newline at end of file
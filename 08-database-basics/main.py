@@ -3,30 +3,64 @@ This is where everything connects!
 We use the database and models to create a working API.
 """
 
-from fastapi import FastAPI, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+import logging
+import os
+from contextlib import asynccontextmanager
+
+import orjson
+from fastapi import FastAPI, Depends, HTTPException, Response, status
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from sqlalchemy import delete, func, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
-from pydantic import BaseModel, EmailStr, Field
+from pydantic import BaseModel, EmailStr, Field, TypeAdapter
 from datetime import datetime
 
 # Import our database stuff
-from database import get_db, create_tables, engine, Base
+from database import get_db, create_tables
 import models
 
-# ===== CREATE TABLES AT STARTUP =====
-# This runs when the app starts
-print("\n" + "="*50)
-print("🚀 Starting FastAPI application...")
-print("="*50 + "\n")
+# ===== LOGGING =====
+# Per-request messages are DEBUG so they cost nothing unless you ask for them
+# (run with LOG_LEVEL=DEBUG to see every step)
+logger = logging.getLogger(__name__)
+
+def setup_logging():
+    """
+    Print this example's log messages to the terminal.
+    Only this example's own loggers get a handler (not the root logger),
+    so an app that runs this one (like Example 9) keeps its own logging.
+    """
+    for name in (__name__, "database"):
+        example_logger = logging.getLogger(name)
+        example_logger.setLevel(os.getenv("LOG_LEVEL", "INFO"))
+        if not example_logger.handlers:  # Startup can run more than once
+            handler = logging.StreamHandler()
+            handler.setFormatter(logging.Formatter(logging.BASIC_FORMAT))
+            example_logger.addHandler(handler)
+            example_logger.propagate = False  # Don't print it twice
 
-# Create all tables
-Base.metadata.create_all(bind=engine)
+# ===== CREATE TABLES AT STARTUP =====
+# This runs when the app starts (creating tables needs the event loop,
+# so it can't happen at import time anymore)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    setup_logging()
+    logger.info("🚀 Starting FastAPI application...")
+    
+    # Create all tables
+    await create_tables()
+    yield
 
 # ===== CREATE FASTAPI APP =====
 app = FastAPI(
     title="Example 8: Database Basics",
     description="Learning how to use PostgreSQL with FastAPI",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
+    # Encode JSON with orjson (written in Rust) instead of the json module
+    default_response_class=ORJSONResponse
 )
 
 # ===== PYDANTIC SCHEMAS =====
@@ -52,63 +86,57 @@ class UserResponse(UserBase):
     class Config:
         from_attributes = True  # Allows SQLAlchemy models to work
 
+# Built once at startup: turns a batch of users straight into JSON bytes,
+# instead of FastAPI validating every row and then json.dumps-ing the list
+users_adapter = TypeAdapter(List[UserResponse])
+
+# ===== HELPERS =====
+
+def _violated_constraint(error: IntegrityError) -> str:
+    """
+    Name of the constraint that rejected a write, e.g. 'ix_users_email'.
+    Returns an empty string if the driver doesn't report it.
+    """
+    # asyncpg's own exception is chained behind SQLAlchemy's wrapper
+    cause = getattr(error.orig, "__cause__", None)
+    return getattr(cause, "constraint_name", None) or ""
+
 # ===== API ENDPOINTS =====
 
+ROOT_BODY = orjson.dumps({
+    "message": "Database Basics Example",
+    "endpoints": {
+        "create_user": "POST /users",
+        "get_all_users": "GET /users",
+        "get_user": "GET /users/{user_id}",
+        "get_by_username": "GET /users/username/{username}",
+        "update_user": "PUT /users/{user_id}",
+        "delete_user": "DELETE /users/{user_id}"
+    },
+    "docs": "/docs"
+})
+
 @app.get("/")
-def read_root():
+async def read_root():
     """Welcome endpoint with usage instructions"""
-    return {
-        "message": "Database Basics Example",
-        "endpoints": {
-            "create_user": "POST /users",
-            "get_all_users": "GET /users",
-            "get_user": "GET /users/{user_id}",
-            "get_by_username": "GET /users/username/{username}",
-            "update_user": "PUT /users/{user_id}",
-            "delete_user": "DELETE /users/{user_id}"
-        },
-        "docs": "/docs"
-    }
+    return Response(content=ROOT_BODY, media_type="application/json")
 
 @app.post("/users", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
-def create_user(user: UserCreate, db: Session = Depends(get_db)):
+async def create_user(user: UserCreate, db: AsyncSession = Depends(get_db)):
     """
     Create a new user.
     
     This is where the magic happens:
-    1. Check if user already exists
-    2. Create new user object
-    3. Add to database session
-    4. Commit (save) to database
-    5. Refresh to get generated ID
-    6. Return the user
+    1. Create new user object
+    2. Add to database session
+    3. Commit (save) to database
+       - The UNIQUE constraints on username/email reject duplicates,
+         so we don't need extra SELECTs to check first
+    4. Refresh to get generated ID
+    5. Return the user
     """
     
-    print(f"\n📝 Creating user: {user.username}")
-    
-    # Check if username already exists
-    existing_user = db.query(models.User).filter(
-        models.User.username == user.username
-    ).first()
-    
-    if existing_user:
-        print(f"❌ Username '{user.username}' already exists!")
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Username '{user.username}' is already taken"
-        )
-    
-    # Check if email already exists
-    existing_email = db.query(models.User).filter(
-        models.User.email == user.email
-    ).first()
-    
-    if existing_email:
-        print(f"❌ Email '{user.email}' already exists!")
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Email '{user.email}' is already registered"
-        )
+    logger.debug("📝 Creating user: %s", user.username)
     
     # Create new user instance
     db_user = models.User(
@@ -120,100 +148,142 @@ def create_user(user: UserCreate, db: Session = Depends(get_db)):
     
     # Add to session (prepares to save)
     db.add(db_user)
-    print(f"➕ Added to session")
+    logger.debug("➕ Added to session")
     
     # Commit (actually save to database)
-    db.commit()
-    print(f"💾 Committed to database")
+    try:
+        await db.commit()
+    except IntegrityError as e:
+        # A duplicate username or email was rejected by the database
+        await db.rollback()
+        constraint = _violated_constraint(e)
+        if "email" in constraint:
+            logger.debug("❌ Email '%s' already exists!", user.email)
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Email '{user.email}' is already registered"
+            )
+        if "username" in constraint:
+            logger.debug("❌ Username '%s' already exists!", user.username)
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Username '{user.username}' is already taken"
+            )
+        # Some other rule failed (or the driver didn't say which one)
+        logger.debug("❌ Database rejected the user: %s", e.orig)
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="User could not be saved: it conflicts with existing data"
+        )
+    logger.debug("💾 Committed to database")
     
     # Refresh (get the new ID from database)
-    db.refresh(db_user)
-    print(f"✅ User created with ID: {db_user.id}")
+    await db.refresh(db_user)
+    logger.debug("✅ User created with ID: %s", db_user.id)
     
     return db_user
 
-@app.get("/users", response_model=List[UserResponse])
-def get_users(
+@app.get(
+    "/users",
+    response_model=None,  # We serialize ourselves (see users_adapter)
+    responses={200: {"model": List[UserResponse]}}  # Still shown in /docs
+)
+async def get_users(
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db)
-):
+    db: AsyncSession = Depends(get_db)
+) -> StreamingResponse:
     """
     Get all users with pagination.
     
     Query breakdown:
-    - db.query(models.User) → Start a query for User table
+    - select(models.User) → Start a query for User table
     - .offset(skip) → Skip N records
     - .limit(limit) → Return max N records
-    - .all() → Execute and return all results
-    """
+    - .execution_options(yield_per=100) → Fetch rows 100 at a time
+    - await db.stream_scalars(...) → Execute, without loading every row
     
-    print(f"\n📖 Getting users (skip={skip}, limit={limit})")
-    
-    users = db.query(models.User)\
-        .offset(skip)\
-        .limit(limit)\
-        .all()
+    The JSON array is streamed out batch by batch, so a big page never
+    has to sit in memory as rows + dicts + one huge JSON string.
+    """
     
-    print(f"✅ Found {len(users)} users")
+    logger.debug("📖 Getting users (skip=%s, limit=%s)", skip, limit)
     
-    return users
+    async def users_json():
+        # The session stays open until the response has been sent
+        result = await db.stream_scalars(
+            select(models.User)
+            .offset(skip)
+            .limit(limit)
+            .execution_options(yield_per=100)
+        )
+        yield b"["
+        first = True
+        async for batch in result.partitions():
+            users = users_adapter.validate_python(batch, from_attributes=True)
+            # "[{...},{...}]" → "{...},{...}" so batches can be joined
+            chunk = users_adapter.dump_json(users)[1:-1]
+            yield chunk if first else b"," + chunk
+            first = False
+        yield b"]"
+    
+    return StreamingResponse(users_json(), media_type="application/json")
 
 @app.get("/users/{user_id}", response_model=UserResponse)
-def get_user(user_id: int, db: Session = Depends(get_db)):
+async def get_user(user_id: int, db: AsyncSession = Depends(get_db)):
     """
     Get a single user by ID.
     
     Query breakdown:
-    - db.query(models.User) → Start query
-    - .filter(models.User.id == user_id) → WHERE id = user_id
-    - .first() → Get first result (or None)
+    - select(models.User) → Start query
+    - .where(models.User.id == user_id) → WHERE id = user_id
+    - .scalar_one_or_none() → Get the result (or None)
     """
     
-    print(f"\n🔍 Looking for user ID: {user_id}")
+    logger.debug("🔍 Looking for user ID: %s", user_id)
     
-    user = db.query(models.User).filter(
-        models.User.id == user_id
-    ).first()
+    user = (await db.execute(
+        select(models.User).where(models.User.id == user_id)
+    )).scalar_one_or_none()
     
     if user is None:
-        print(f"❌ User {user_id} not found!")
+        logger.debug("❌ User %s not found!", user_id)
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"User with id {user_id} not found"
         )
     
-    print(f"✅ Found user: {user.username}")
+    logger.debug("✅ Found user: %s", user.username)
     return user
 
 @app.get("/users/username/{username}", response_model=UserResponse)
-def get_user_by_username(username: str, db: Session = Depends(get_db)):
+async def get_user_by_username(username: str, db: AsyncSession = Depends(get_db)):
     """
     Get a user by username.
     Shows how to filter by different fields.
     """
     
-    print(f"\n🔍 Looking for username: {username}")
+    logger.debug("🔍 Looking for username: %s", username)
     
-    user = db.query(models.User).filter(
-        models.User.username == username
-    ).first()
+    user = (await db.execute(
+        select(models.User).where(models.User.username == username)
+    )).scalar_one_or_none()
     
     if user is None:
-        print(f"❌ Username '{username}' not found!")
+        logger.debug("❌ Username '%s' not found!", username)
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"User '{username}' not found"
         )
     
-    print(f"✅ Found user: {user.username} (ID: {user.id})")
+    logger.debug("✅ Found user: %s (ID: %s)", user.username, user.id)
     return user
 
 @app.put("/users/{user_id}", response_model=UserResponse)
-def update_user(
+async def update_user(
     user_id: int,
     user_update: UserCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Update an existing user.
@@ -225,15 +295,15 @@ def update_user(
     4. Return updated user
     """
     
-    print(f"\n✏️  Updating user ID: {user_id}")
+    logger.debug("✏️  Updating user ID: %s", user_id)
     
     # Find user
-    db_user = db.query(models.User).filter(
-        models.User.id == user_id
-    ).first()
+    db_user = (await db.execute(
+        select(models.User).where(models.User.id == user_id)
+    )).scalar_one_or_none()
     
     if db_user is None:
-        print(f"❌ User {user_id} not found!")
+        logger.debug("❌ User %s not found!", user_id)
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"User with id {user_id} not found"
@@ -246,14 +316,14 @@ def update_user(
     db_user.is_active = user_update.is_active
     
     # Commit changes
-    db.commit()
-    db.refresh(db_user)
+    await db.commit()
+    await db.refresh(db_user)
     
-    print(f"✅ User updated successfully")
+    logger.debug("✅ User updated successfully")
     return db_user
 
 @app.delete("/users/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_user(user_id: int, db: Session = Depends(get_db)):
+async def delete_user(user_id: int, db: AsyncSession = Depends(get_db)):
     """
     Delete a user permanently.
     
@@ -263,40 +333,47 @@ def delete_user(user_id: int, db: Session = Depends(get_db)):
     3. Commit
     """
     
-    print(f"\n🗑️  Deleting user ID: {user_id}")
+    logger.debug("🗑️  Deleting user ID: %s", user_id)
     
     # Find user
-    db_user = db.query(models.User).filter(
-        models.User.id == user_id
-    ).first()
+    db_user = (await db.execute(
+        select(models.User).where(models.User.id == user_id)
+    )).scalar_one_or_none()
     
     if db_user is None:
-        print(f"❌ User {user_id} not found!")
+        logger.debug("❌ User %s not found!", user_id)
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"User with id {user_id} not found"
         )
     
     # Delete
-    db.delete(db_user)
-    db.commit()
+    await db.delete(db_user)
+    await db.commit()
     
-    print(f"✅ User deleted successfully")
+    logger.debug("✅ User deleted successfully")
     return None
 
 # ===== UTILITY ENDPOINTS =====
 
 @app.get("/stats")
-def get_stats(db: Session = Depends(get_db)):
+async def get_stats(db: AsyncSession = Depends(get_db)):
     """
     Get database statistics.
     Shows how to do aggregations.
+    
+    One GROUP BY query counts users per is_active value:
+    SELECT is_active, count(*) FROM users GROUP BY is_active
     """
     
-    total_users = db.query(models.User).count()
-    active_users = db.query(models.User).filter(
-        models.User.is_active == True
-    ).count()
+    result = await db.execute(
+        select(models.User.is_active, func.count())
+        .group_by(models.User.is_active)
+    )
+    counts = dict(result.all())
+    
+    total_users = sum(counts.values())
+    active_users = counts.get(True, 0)
     inactive_users = total_users - active_users
     
     return {
@@ -306,20 +383,28 @@ def get_stats(db: Session = Depends(get_db)):
     }
 
 @app.post("/reset-database")
-def reset_database(db: Session = Depends(get_db)):
+async def reset_database(db: AsyncSession = Depends(get_db)):
     """
     ⚠️ DANGER: Deletes all users!
     Useful for testing.
     """
     
-    print("\n⚠️  RESETTING DATABASE...")
+    logger.debug("⚠️  RESETTING DATABASE...")
     
-    deleted = db.query(models.User).delete()
-    db.commit()
+    deleted = (await db.execute(delete(models.User))).rowcount
+    await db.commit()
     
-    print(f"💥 Deleted {deleted} users")
+    logger.warning("💥 Deleted %s users", deleted)
     
     return {
         "message": f"Database reset. Deleted {deleted} users.",
         "warning": "All data has been removed!"
-    }
\ No newline at end of file
+    }
+
+if __name__ == "__main__":
+    import uvicorn
+    uvicorn.run(
+        app, host="127.0.0.1", port=8000,
+        loop="auto", http="auto",
+        log_level="warning", access_log=False
+    )
@@ -0,0 +1,103 @@
+"""
+All the examples in ONE app.
+
+Each example lives under its own prefix:
+    /ex1/...  → 01-hello-world
+    /ex2/...  → 02-path-parameters
+    ...
+    /ex8/...  → 08-database-basics (needs its .env, see that folder)
+
+Each example is mounted as its own app, so it keeps its own docs:
+    /ex1/docs, /ex2/docs, ...
+
+Run it from this folder:
+    uvicorn main9:app --reload
+"""
+
+import importlib.util
+import sys
+from contextlib import AsyncExitStack, asynccontextmanager
+from pathlib import Path
+
+from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
+
+from static_routes import StaticRouteMiddleware
+from trie_router import TrieRouter
+
+# ===== LOAD THE EXAMPLE APPS =====
+# The example folders start with numbers, so they can't be imported the
+# usual way - we load each main*.py file by its path instead
+
+ROOT = Path(__file__).resolve().parent.parent
+
+EXAMPLES = [
+    "01-hello-world/main1.py",
+    "02-path-parameters/main2.py",
+    "03-query-parameters/main3.py",
+    "04-request-body/06-status-codes/07/main4.py",
+    "05-response-models/main5.py",
+    "06-status-codes/main6.py",
+    "07-dependencies/main7.py",
+    "08-database-basics/main.py",
+]
+
+def load_app(relative_path: str) -> FastAPI:
+    """
+    Import an example's main file and return its `app`.
+    """
+    path = ROOT / relative_path
+    # Lets the example import its neighbours (e.g. database.py, models.py)
+    sys.path.insert(0, str(path.parent))
+    spec = importlib.util.spec_from_file_location(path.stem, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[path.stem] = module
+    spec.loader.exec_module(module)
+    return module.app
+
+example_apps = [load_app(relative_path) for relative_path in EXAMPLES]
+
+# ===== STARTUP / SHUTDOWN =====
+# Mounted apps don't get startup/shutdown events by themselves, so we run
+# each example's lifespan here (e.g. Example 8 creates its tables)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    async with AsyncExitStack() as stack:
+        for example_app in example_apps:
+            await stack.enter_async_context(
+                example_app.router.lifespan_context(example_app)
+            )
+        yield
+
+# ===== CREATE THE COMBINED APP =====
+app = FastAPI(
+    title="Example 9: Combined App",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
+)
+
+# Mount each example under its own prefix. The top-level router then only
+# holds one route per example, and a request is matched against the routes
+# of the ONE example its prefix points to - not all of them.
+#
+# Inside each example, find routes by walking a tree of path segments
+# instead of trying every route's regex in turn
+for number, example_app in enumerate(example_apps, start=1):
+    example_app.router.middleware_stack = TrieRouter(example_app.router)
+    app.mount(f"/ex{number}", example_app)
+
+# The top-level router gets one too, so picking the example is a single
+# step down the tree
+app.router.middleware_stack = TrieRouter(app.router)
+
+# Answer the simple GET endpoints ("/ex1/", "/ex1/greet", ...) with a dict
+# lookup instead of walking the whole route list
+app.add_middleware(StaticRouteMiddleware, router=app.router)
+
+if __name__ == "__main__":
+    import uvicorn
+    uvicorn.run(
+        app, host="127.0.0.1", port=8000,
+        loop="auto", http="auto",
+        log_level="warning", access_log=False
+    )
@@ -0,0 +1,127 @@
+"""
+A shortcut for the simplest GET endpoints.
+
+Normally every request walks the router's list of routes and tries each
+route's regex until one matches. Endpoints like "/" or "/greet" have a fixed
+path and take no parameters at all, so we can find them with one dict lookup
+and call them directly.
+
+Because they are called directly, these endpoints skip the (mounted) app's
+own middleware and exception handlers. An HTTPException still turns into
+FastAPI's usual {"detail": ...} response, but custom handlers are not used.
+"""
+
+from inspect import iscoroutinefunction
+
+from fastapi.datastructures import DefaultPlaceholder
+from fastapi.exception_handlers import http_exception_handler
+from fastapi.routing import APIRoute
+from starlette._utils import get_route_path
+from starlette.exceptions import HTTPException
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.routing import BaseRoute, Match, Mount, Router
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+
+def is_static_route(route) -> bool:
+    """
+    True if a route can be served without FastAPI's request handling:
+    a fixed path, no parameters, no dependencies, no response_model
+    and an async endpoint.
+    """
+    if not isinstance(route, APIRoute) or "GET" not in route.methods:
+        return False
+    if "{" in route.path or route.response_model is not None:
+        return False
+    if not iscoroutinefunction(route.endpoint):
+        return False
+    dependant = route.dependant
+    return not (
+        dependant.path_params
+        or dependant.query_params
+        or dependant.header_params
+        or dependant.cookie_params
+        or dependant.body_params
+        or dependant.dependencies
+        or dependant.request_param_name
+        or dependant.response_param_name
+        or dependant.background_tasks_param_name
+    )
+
+
+def matches_first(route: BaseRoute, path: str) -> bool:
+    """
+    True if `route` would answer GET `path`.
+    """
+    scope = {"type": "http", "method": "GET", "path": path, "root_path": ""}
+    match, _ = route.matches(scope)
+    return match == Match.FULL
+
+
+def static_routes(routes):
+    """
+    Yields (full path, route) for every static route, including the ones
+    inside mounted apps (a mount at "/ex1" + route "/greet" → "/ex1/greet").
+
+    A static route is left out if an earlier route would match its path
+    first - e.g. "/products/{product_id}" declared before "/products/latest"
+    ("Order matters!", see main2.py).
+    """
+    earlier = []
+    for route in routes:
+        if isinstance(route, Mount) and "{" not in route.path:
+            found = [(route.path + path, static) for path, static in static_routes(route.routes)]
+        elif is_static_route(route):
+            found = [(route.path, route)]
+        else:
+            found = []
+        for path, static in found:
+            if not any(matches_first(other, path) for other in earlier):
+                yield path, static
+        earlier.append(route)
+
+
+class StaticRouteMiddleware:
+    """
+    ASGI middleware that answers static GET routes from a dict.
+
+    The table maps path → route and is built on the first request, once all
+    routes are registered. Anything not in the table goes to the normal app.
+    """
+
+    def __init__(self, app: ASGIApp, router: Router) -> None:
+        self.app = app
+        self.router = router
+        self.routes: dict[str, APIRoute] | None = None
+
+    def build_table(self) -> dict[str, APIRoute]:
+        return dict(static_routes(self.router.routes))
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] != "GET":
+            await self.app(scope, receive, send)
+            return
+
+        if self.routes is None:
+            self.routes = self.build_table()
+
+        route = self.routes.get(get_route_path(scope))
+        if route is None:
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            content = await route.endpoint()
+        except HTTPException as exc:
+            # We skipped the app's exception handling, so turn it into the
+            # same {"detail": ...} response FastAPI would have sent
+            response = await http_exception_handler(Request(scope, receive), exc)
+            await response(scope, receive, send)
+            return
+        if not isinstance(content, Response):
+            response_class = route.response_class
+            if isinstance(response_class, DefaultPlaceholder):
+                response_class = response_class.value
+            content = response_class(content, status_code=route.status_code or 200)
+        await content(scope, receive, send)
@@ -0,0 +1,152 @@
+"""
+Finding the right route with a trie (a tree of path segments).
+
+Starlette's router tries every route's regex, one after the other, until one
+matches. An example with a dozen routes checks up to a dozen regexes per
+request - and a 404 has to try them all.
+
+Here the route paths are split on "/" and stored in a tree
+(Example 2's routes):
+
+    (root)
+     ├── users
+     │    └── {param}           → /users/{user_id}
+     │         └── profile      → /users/{username}/profile
+     └── products
+          ├── latest            → /products/latest
+          └── {param}           → /products/{product_id}
+     ...
+
+A request walks the tree once, segment by segment, and only the few routes
+at the end of that walk get their regex checked. They are checked in the
+order they were added, so "Order matters!" (see main2.py) still holds.
+"""
+
+from starlette._utils import get_route_path
+from starlette.routing import BaseRoute, Match, Mount, Route, Router, WebSocketRoute
+from starlette.types import Receive, Scope, Send
+
+
+def split_path(path: str) -> list[str]:
+    """
+    "/users/{user_id}/" → ["users", "{user_id}"]
+    """
+    path = path.strip("/")
+    return path.split("/") if path else []
+
+
+class TrieNode:
+    """
+    One path segment in the tree.
+    """
+
+    __slots__ = ("children", "param_child", "routes", "prefix_routes")
+
+    def __init__(self) -> None:
+        self.children: dict[str, TrieNode] = {}    # Fixed segments, e.g. "users"
+        self.param_child: TrieNode | None = None   # Any segment, e.g. "{user_id}"
+        self.routes: list[tuple[int, BaseRoute]] = []         # Routes ending here
+        self.prefix_routes: list[tuple[int, BaseRoute]] = []  # Mounts starting here
+
+    def child(self, segment: str) -> "TrieNode":
+        if "{" in segment:
+            if self.param_child is None:
+                self.param_child = TrieNode()
+            return self.param_child
+        if segment not in self.children:
+            self.children[segment] = TrieNode()
+        return self.children[segment]
+
+
+class TrieRouter:
+    """
+    Replaces the route loop of a Starlette/FastAPI router.
+
+    Install it on an app with:
+        app.router.middleware_stack = TrieRouter(app.router)
+
+    Routes the tree can't describe (e.g. "{file_path:path}", which spans
+    several segments) are kept in a list that is always checked.
+    """
+
+    def __init__(self, router: Router) -> None:
+        self.router = router
+        self.root = TrieNode()
+        self.always: list[tuple[int, BaseRoute]] = []
+        self.route_count = -1  # Number of routes when the tree was built
+
+    def build(self) -> None:
+        self.root = TrieNode()
+        self.always = []
+        for index, route in enumerate(self.router.routes):
+            if isinstance(route, (Route, WebSocketRoute, Mount)) and ":path}" not in route.path:
+                node = self.root
+                for segment in split_path(route.path):
+                    node = node.child(segment)
+                if isinstance(route, Mount):
+                    node.prefix_routes.append((index, route))
+                else:
+                    node.routes.append((index, route))
+            else:
+                self.always.append((index, route))
+        self.route_count = len(self.router.routes)
+
+    def candidates(self, path: str) -> list[BaseRoute]:
+        """
+        Every route that could match this path, in the router's order.
+        """
+        found = list(self.always)
+        nodes = [self.root]
+        for segment in split_path(path):
+            next_nodes = []
+            for node in nodes:
+                found.extend(node.prefix_routes)
+                if segment in node.children:
+                    next_nodes.append(node.children[segment])
+                if node.param_child is not None:
+                    next_nodes.append(node.param_child)
+            nodes = next_nodes
+        for node in nodes:
+            found.extend(node.prefix_routes)
+            found.extend(node.routes)
+        found.sort(key=lambda item: item[0])
+        return [route for _, route in found]
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        # Startup/shutdown and websockets go through the normal router
+        if scope["type"] != "http":
+            await self.router.app(scope, receive, send)
+            return
+
+        if self.route_count != len(self.router.routes):
+            self.build()
+
+        if "router" not in scope:
+            scope["router"] = self.router
+
+        routes = self.candidates(get_route_path(scope))
+        if not routes:
+            # Nothing can match, not even with a slash added/removed
+            await self.router.default(scope, receive, send)
+            return
+
+        # Same matching rules as Starlette's Router.app, on far fewer routes
+        partial = None
+        for route in routes:
+            match, child_scope = route.matches(scope)
+            if match == Match.FULL:
+                scope.update(child_scope)
+                await route.handle(scope, receive, send)
+                return
+            elif match == Match.PARTIAL and partial is None:
+                partial = route
+                partial_scope = child_scope
+
+        if partial is not None:
+            # Right path, wrong method → 405 Method Not Allowed
+            scope.update(partial_scope)
+            await partial.handle(scope, receive, send)
+            return
+
+        # Let the normal router handle trailing-slash redirects and the 404
+        await self.router.app(scope, receive, send)